@@ -2,7 +2,11 @@ import argparse
 import sys
 import os
 import re
-from typing import List, Dict, Any
+import mmap
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import List, Dict, Any, Tuple
 
 try:
     import sqlglot
@@ -11,92 +15,241 @@ try:
     from mimesis.locales import Locale
 except ImportError:
     print("Error: Required libraries 'mimesis' and 'sqlglot' are not installed.")
-    print("Please install them using: pip install mimesis sqlglot")
+    print("Please install them using: pip install mimesis \"sqlglot[rs]\"")
     sys.exit(1)
 
-def map_column_to_mimesis(col_name: str, col_type: str, generic: Generic) -> Any:
+try:
+    import sqlglotrs  # noqa: F401 -- sqlglot picks up the Rust tokenizer automatically
+except ImportError:
+    print("Warning: 'sqlglotrs' (Rust tokenizer) is not installed; schema parsing "
+          "will be slower. Install it with: pip install \"sqlglot[rs]\"")
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: numeric columns fall back to per-row mimesis calls
+    np = None
+
+def _datetime_provider(generic: Generic) -> Tuple[Any, str, Any]:
+    # Standard SQL format instead of ISO format with 'T'; plain
+    # %-formatting is several times faster per call than strftime
+    _dt = generic.datetime.datetime
+    def sql_datetime():
+        d = _dt()
+        return "%04d-%02d-%02d %02d:%02d:%02d" % (d.year, d.month, d.day, d.hour, d.minute, d.second)
+    return sql_datetime, 'ustr', None
+
+# Ordered provider rules keyed on column-name keywords; first match wins.
+# Each entry maps to a factory returning (provider, output kind, bulk spec).
+_NAME_RULES = [
+    (('email',), lambda g: (g.person.email, 'ustr', None)),
+    (('first_name', 'firstname'), lambda g: (g.person.first_name, 'ustr', None)),
+    (('last_name', 'lastname'), lambda g: (g.person.last_name, 'ustr', None)),
+    (('name',), lambda g: (g.person.full_name, 'ustr', None)),
+    (('phone', 'tel'), lambda g: (g.person.phone_number, 'ustr', None)),
+    (('address',), lambda g: (g.address.address, 'ustr', None)),
+    (('city',), lambda g: (g.address.city, 'str', None)),
+    (('country',), lambda g: (g.address.country, 'str', None)),
+    (('zip', 'postal'), lambda g: (g.address.zip_code, 'ustr', None)),
+    (('company',), lambda g: (g.finance.company, 'str', None)),
+    (('date', 'created_at', 'updated_at'), _datetime_provider),
+    (('price', 'amount', 'salary'), lambda g: (lambda: g.numeric.decimal_number(10, 2), 'num', None)),
+]
+
+# Fallback rules keyed on SQL-type keywords
+_TYPE_RULES = [
+    (('int',), lambda g: (lambda: g.numeric.integer_number(1, 100000), 'num', ('int', 1, 100000))),
+    (('float', 'decimal', 'numeric', 'double'), lambda g: (lambda: g.numeric.float_number(1.0, 1000000.0, 2), 'num', ('float', 1.0, 1000000.0, 2))),
+    (('char', 'text'), lambda g: (g.text.word, 'str', None)),
+    (('bool', 'bit'), lambda g: (lambda: g.choice([True, False]), 'bool', None)),
+]
+
+def _fk_provider(g: Generic) -> Tuple[Any, str, Any]:
+    # Default to a safe range (1-10) for common lookups like roles, statuses, etc.
+    return lambda: g.numeric.integer_number(1, 10), 'num', ('int', 1, 10)
+
+def _fallback_provider(g: Generic) -> Tuple[Any, str, Any]:
+    return g.text.word, 'str', None
+
+@lru_cache(maxsize=None)
+def _classify_column(name: str, t: str) -> Any:
     """
-    Maps a column name and type to a Mimesis provider function.
+    Picks the provider factory for a lowered (name, type) pair. Cached so
+    columns sharing a signature -- common across wide tables and repeated
+    lookups -- skip the keyword scan.
     """
-    name = col_name.lower()
-    t = col_type.lower()
-
     # Priority mapping by column name
-    if 'email' in name:
-        return generic.person.email
-    if 'first_name' in name or 'firstname' in name:
-        return generic.person.first_name
-    if 'last_name' in name or 'lastname' in name:
-        return generic.person.last_name
-    if 'name' in name:
-        return generic.person.full_name
-    if 'phone' in name or 'tel' in name:
-        return generic.person.phone_number
-    if 'address' in name:
-        return generic.address.address
-    if 'city' in name:
-        return generic.address.city
-    if 'country' in name:
-        return generic.address.country
-    if 'zip' in name or 'postal' in name:
-        return generic.address.zip_code
-    if 'company' in name:
-        return generic.finance.company
-    if 'date' in name or 'created_at' in name or 'updated_at' in name:
-        # Standard SQL format instead of ISO format with 'T'
-        return lambda: generic.datetime.datetime().strftime('%Y-%m-%d %H:%M:%S')
-    if 'price' in name or 'amount' in name or 'salary' in name:
-        return lambda: generic.numeric.decimal_number(10, 2)
-    
+    for keys, make in _NAME_RULES:
+        if any(k in name for k in keys):
+            return make
+
     # Heuristics for Foreign Keys often prefixed with 'id_'
     if name.startswith('id_') and name != 'id_usuario' and name != 'id':
-        # Default to a safe range (1-10) for common lookups like roles, statuses, etc.
-        return lambda: generic.numeric.integer_number(1, 10)
+        return _fk_provider
 
     # Type-based mapping if name doesn't match
-    if 'int' in t:
-        return lambda: generic.numeric.integer_number(1, 100000)
-    if 'float' in t or 'decimal' in t or 'numeric' in t or 'double' in t:
-        return lambda: generic.numeric.float_number(1.0, 1000000.0, 2)
-    if 'char' in t or 'text' in t:
-        return lambda: generic.text.word()
-    if 'bool' in t or 'bit' in t:
-        return lambda: generic.choice([True, False])
-    
+    for keys, make in _TYPE_RULES:
+        if any(k in t for k in keys):
+            return make
+
     # Generic fallback
-    return lambda: generic.text.word()
+    return _fallback_provider
 
-def format_sql_value(val: Any, engine: str) -> str:
+def map_column_to_mimesis(col_name: str, col_type: str, generic: Generic) -> Tuple[Any, str, Any]:
     """
-    Formats a Python value as a SQL literal.
+    Maps a column name and type to a Mimesis provider function.
+    Returns the provider, its output kind ('str' for strings drawn from a
+    finite vocabulary, 'ustr' for high-cardinality strings, 'num' or 'bool')
+    and, for numeric columns, a bulk spec describing how to pre-draw the
+    whole column with numpy. Only the rule choice is cached; the provider
+    itself is rebuilt so it closes over the caller's generator.
     """
-    if val is None:
-        return "NULL"
-    if isinstance(val, bool):
-        if engine == 'mssql':
-            return '1' if val else '0'
-        return 'TRUE' if val else 'FALSE'
-    if isinstance(val, (int, float)):
-        return str(val)
+    return _classify_column(col_name.lower(), col_type.lower())(generic)
+
+@lru_cache(maxsize=8192)
+def _quote(s: str) -> str:
+    return "'" + s.replace("'", "''") + "'"
+
+def make_formatter(kind: str, engine: str) -> Any:
+    """
+    Builds a SQL-literal formatter for one column, so the row loop calls
+    a specialized closure instead of dispatching on the value type.
+    """
+    if kind == 'bool':
+        true, false = ('1', '0') if engine == 'mssql' else ('TRUE', 'FALSE')
+        return lambda v: true if v else false
+    if kind == 'num':
+        return str
+    if kind == 'str':
+        # Providers with a finite vocabulary repeat values, so the escaped
+        # literal is memoized; high-cardinality columns skip the cache
+        return _quote
     # Escape single quotes
-    escaped_val = str(val).replace("'", "''")
-    return f"'{escaped_val}'"
+    return lambda v: "'" + str(v).replace("'", "''") + "'"
+
+def format_insert_batch(table: str, col_names: str, batch: List[str], engine: str) -> str:
+    """
+    Formats one batch of value tuples as a single INSERT statement.
+    Oracle does not accept multi-row VALUES, so it gets the INSERT ALL form.
+    """
+    if engine == 'oracle':
+        rows = "\n".join(f"  INTO {table} ({col_names}) VALUES {values}" for values in batch)
+        return f"INSERT ALL\n{rows}\nSELECT 1 FROM DUAL;\n"
+    return f"INSERT INTO {table} ({col_names}) VALUES {','.join(batch)};\n"
+
+def build_row_pipeline(columns: List[Dict[str, Any]], engine: str, rows: int) -> List[Tuple[Any, Any]]:
+    """
+    Builds the (provider, formatter) pair for each column of one generator
+    run. Numeric columns are pre-drawn in bulk with numpy when available,
+    in which case the provider is the iterator over the drawn array.
+    """
+    generic = Generic(locale=Locale.EN)
+    rng = np.random.default_rng() if np is not None else None
+    pairs = []
+    for col in columns:
+        provider, kind, bulk = map_column_to_mimesis(col['name'], col['type'], generic)
+        if rng is not None and bulk is not None:
+            if bulk[0] == 'int':
+                arr = rng.integers(bulk[1], bulk[2], size=rows, endpoint=True)
+            else:
+                arr = rng.uniform(bulk[1], bulk[2], size=rows).round(bulk[3])
+            provider = iter(arr.tolist()).__next__
+        pairs.append((provider, make_formatter(kind, engine)))
+    return pairs
+
+def compile_row_emitter(pairs: List[Tuple[Any, Any]]) -> Any:
+    """
+    Compiles a zero-argument function specialized to this schema: every
+    column's provider and formatter become direct calls inlined into one
+    expression, so the hot loop runs a single generated bytecode blob
+    instead of iterating (provider, formatter) pairs per row.
+    """
+    if not pairs:
+        return lambda: "()"
+    ns = {}
+    for i, (provider, fmt) in enumerate(pairs):
+        ns[f'_p{i}'] = provider
+        ns[f'_f{i}'] = fmt
+    body = " + ',' + ".join(f"_f{i}(_p{i}())" for i in range(len(pairs)))
+    exec(compile(f"def _emit_row():\n    return '(' + {body} + ')'\n", '<row-emitter>', 'exec'), ns)
+    return ns['_emit_row']
+
+# Below this row count the worker-pool startup outweighs the parallel win
+_PARALLEL_THRESHOLD = 10_000
+
+# Flush the reusable write buffer once it holds this many bytes
+_WRITE_BUF_SIZE = 1 << 20
+
+# Drop written pages from the page cache every this many bytes, so GB-scale
+# dumps do not evict hotter data; not available on Windows
+_FADVISE_INTERVAL = 16 << 20
+_HAS_FADVISE = hasattr(os, 'posix_fadvise')
+
+def _advise_dont_need(f, advised: int) -> int:
+    """
+    Tells the kernel the range written since the last call will not be
+    re-read. Returns the new advised offset.
+    """
+    pos = f.tell()
+    if pos - advised >= _FADVISE_INTERVAL:
+        f.flush()
+        os.posix_fadvise(f.fileno(), advised, pos - advised, os.POSIX_FADV_DONTNEED)
+        return pos
+    return advised
+
+def _generate_chunk(columns: List[Dict[str, Any]], engine: str, table: str, col_names: str, n_rows: int) -> bytes:
+    """
+    Worker for parallel generation. Providers are closures and cannot be
+    pickled, so each process rebuilds its own pipeline from the column list
+    and returns the UTF-8 encoded INSERT statements for its share of rows.
+    """
+    emit_row = compile_row_emitter(build_row_pipeline(columns, engine, n_rows))
+    out = bytearray()
+    batch = []
+    for _ in range(n_rows):
+        batch.append(emit_row())
+        if len(batch) >= 500:
+            out += format_insert_batch(table, col_names, batch, engine).encode('utf-8')
+            batch.clear()
+    if batch:
+        out += format_insert_batch(table, col_names, batch, engine).encode('utf-8')
+    return bytes(out)
+
+# argparse engine names that differ from sqlglot dialect names
+_ENGINE_DIALECTS = {'postgresql': 'postgres', 'mssql': 'tsql'}
+
+_parse_cache: Dict[Tuple[int, str], List[Any]] = {}
+
+def _parse_sql(sql_content: str, dialect: str) -> List[Any]:
+    """
+    Memoized sqlglot.parse, so the same script is never parsed twice with
+    the same dialect (e.g. when looking up several tables).
+    """
+    key = (hash(sql_content), dialect)
+    if key not in _parse_cache:
+        _parse_cache[key] = sqlglot.parse(sql_content, read=dialect)
+    return _parse_cache[key]
 
-def parse_schema(sql_content: str, table_name: str) -> List[Dict[str, Any]]:
+def parse_schema(sql_content: str, table_name: str, engine: str = None) -> List[Dict[str, Any]]:
     """
     Parses the SQL content to find the table schema.
     """
-    # Try multiple dialects for parsing
+    # Try the dialect matching the target engine first; only fall back to
+    # the other dialects if that parse fails
+    target = table_name.lower()
     dialects = ['mysql', 'postgres', 'oracle', 'tsql']
-    
+    if engine:
+        preferred = _ENGINE_DIALECTS.get(engine, engine)
+        dialects = [preferred] + [d for d in dialects if d != preferred]
+
     for dialect in dialects:
         try:
-            expressions = sqlglot.parse(sql_content, read=dialect)
+            expressions = _parse_sql(sql_content, dialect)
             for expression in expressions:
                 if isinstance(expression, exp.Create) and expression.this.arg_key == 'table':
                     # Support both simple "table" and "db.table" or "[table]"
                     found_table_name = expression.this.this.name.lower()
-                    if found_table_name == table_name.lower():
+                    if found_table_name == target:
                         columns = []
                         for schema_def in expression.this.expressions:
                             if isinstance(schema_def, exp.ColumnDef):
@@ -120,12 +273,41 @@ def parse_schema(sql_content: str, table_name: str) -> List[Dict[str, Any]]:
         except Exception:
             continue
             
-    # Regex fallback if sqlglot fails
-    pattern = rf"CREATE\s+TABLE\s+(?:\"|'|`|\[)?{re.escape(table_name)}(?:\"|'|`|\])?\s*\((.*?)\);"
-    match = re.search(pattern, sql_content, re.IGNORECASE | re.DOTALL)
-    if match:
-        col_content = match.group(1)
-        
+    # Hand-written scanner fallback if sqlglot fails: locate the CREATE TABLE
+    # for our table with str.find and bracket-match its column block in a
+    # single forward pass, avoiding a backtracking DOTALL regex
+    low = sql_content.lower()
+    col_content = None
+    pos = 0
+    while col_content is None:
+        hit = low.find('create table', pos)
+        if hit == -1:
+            break
+        pos = hit + len('create table')
+        i = pos
+        while i < len(low) and low[i] in ' \t\r\n':
+            i += 1
+        start = i
+        while i < len(low) and low[i] not in ' \t\r\n(':
+            i += 1
+        if low[start:i].strip('"`\'[]') != target:
+            continue
+        open_idx = low.find('(', i)
+        if open_idx == -1:
+            break
+        depth = 1
+        j = open_idx + 1
+        while j < len(low) and depth > 0:
+            if low[j] == '(':
+                depth += 1
+            elif low[j] == ')':
+                depth -= 1
+            j += 1
+        if depth == 0:
+            col_content = sql_content[open_idx + 1:j - 1]
+
+    if col_content is not None:
+
         # Split by comma but ignore commas inside parentheses (like IDENTITY(1,1) or DECIMAL(10,2))
         col_definitions = []
         current_col = []
@@ -148,13 +330,14 @@ def parse_schema(sql_content: str, table_name: str) -> List[Dict[str, Any]]:
         columns = []
         for line in col_definitions:
             line = line.strip()
-            if not line or line.upper().startswith(('PRIMARY', 'FOREIGN', 'KEY', 'CONSTRAINT', 'INDEX')):
+            line_up = line.upper()
+            if not line or line_up.startswith(('PRIMARY', 'FOREIGN', 'KEY', 'CONSTRAINT', 'INDEX')):
                 continue
             parts = line.split()
             if parts:
                 col_name = parts[0].strip('"`\'[]')
                 col_type = parts[1] if len(parts) > 1 else 'TEXT'
-                is_identity = 'IDENTITY' in line.upper() or 'AUTO_INCREMENT' in line.upper() or 'SERIAL' in line.upper()
+                is_identity = 'IDENTITY' in line_up or 'AUTO_INCREMENT' in line_up or 'SERIAL' in line_up
                 columns.append({
                     'name': col_name, 
                     'type': col_type, 
@@ -164,23 +347,20 @@ def parse_schema(sql_content: str, table_name: str) -> List[Dict[str, Any]]:
 
     return []
 
-def extract_database_name(sql_content: str, engine: str) -> str:
+# Matches either a USE or CREATE DATABASE statement; compiled once so the
+# file is scanned in a single pass
+_DB_RE = re.compile(rb"(?:USE|CREATE\s+DATABASE)\s+([a-zA-Z0-9_\[\]`\"']+)", re.IGNORECASE)
+
+def extract_database_name(sql_content: Any, engine: str) -> str:
     """
-    Attempts to extract the database name from the SQL content.
-    Looks for USE statement or CREATE DATABASE statement.
+    Attempts to extract the database name from the SQL content, given as a
+    bytes-like object (e.g. the mmap'd script, scanned without decoding).
+    Looks for a USE statement or CREATE DATABASE statement.
     """
-    # Look for USE statement
-    use_pattern = r"USE\s+([a-zA-Z0-9_\[\]`\"']+)"
-    match = re.search(use_pattern, sql_content, re.IGNORECASE)
+    match = _DB_RE.search(sql_content)
     if match:
-        return match.group(1).strip('[]"`\'')
-        
-    # Look for CREATE DATABASE statement
-    create_pattern = r"CREATE\s+DATABASE\s+([a-zA-Z0-9_\[\]`\"']+)"
-    match = re.search(create_pattern, sql_content, re.IGNORECASE)
-    if match:
-        return match.group(1).strip('[]"`\'')
-        
+        return match.group(1).decode('utf-8').strip('[]"`\'')
+
     return None
 
 def main():
@@ -198,15 +378,26 @@ def main():
         print(f"Error: Script file '{args.script}' not found.")
         sys.exit(1)
 
-    with open(args.script, 'r') as f:
-        sql_content = f.read()
+    # Map the script instead of read()ing a copy: pages load lazily and the
+    # database-name regex scans the raw bytes without decoding
+    detected_db = None
+    with open(args.script, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if not args.db:
+                    detected_db = extract_database_name(mm, args.engine)
+                # sqlglot needs a str, so decode once
+                sql_content = mm[:].decode('utf-8')
+        except ValueError:
+            # Empty files cannot be mapped
+            sql_content = ''
 
-    all_columns = parse_schema(sql_content, args.table)
+    all_columns = parse_schema(sql_content, args.table, args.engine)
     if not all_columns:
         print(f"Error: Could not find table '{args.table}' in the script.")
         sys.exit(1)
         
-    db_name = args.db or extract_database_name(sql_content, args.engine)
+    db_name = args.db or detected_db
     if db_name:
         print(f"Detected database context: '{db_name}'")
 
@@ -219,43 +410,77 @@ def main():
         status = "[SKIP - IDENTITY]" if col['is_identity'] else ""
         print(f"  - {col['name']} ({col['type']}) {status}")
 
-    generic = Generic(locale=Locale.EN)
-    providers = {col['name']: map_column_to_mimesis(col['name'], col['type'], generic) for col in columns}
-
     output_file = args.output or f"{args.table}_dump.sql"
-    
-    with open(output_file, 'w') as f:
-        f.write(f"-- Synthetic data for table {args.table}\n")
-        f.write(f"-- Generated for engine: {args.engine}\n")
+
+    # Binary mode with a large explicit buffer: chunks are encoded once and
+    # the OS sees few big writes instead of one per row
+    with open(output_file, 'wb', buffering=1 << 20) as f:
+        header = [f"-- Synthetic data for table {args.table}\n",
+                  f"-- Generated for engine: {args.engine}\n"]
         if identity_columns:
-            f.write(f"-- Skipped identity columns: {', '.join([c['name'] for c in identity_columns])}\n")
-        f.write("\n")
-        
+            header.append(f"-- Skipped identity columns: {', '.join([c['name'] for c in identity_columns])}\n")
+        header.append("\n")
+
         if db_name:
             if args.engine == 'mssql':
-                f.write(f"USE [{db_name}];\nGO\n\n")
+                header.append(f"USE [{db_name}];\nGO\n\n")
             else:
-                f.write(f"USE {db_name};\n\n")
-                
+                header.append(f"USE {db_name};\n\n")
+
         if args.engine == 'mssql':
-            f.write("-- Disable constraints for synthetic data insertion\n")
-            f.write("EXEC sp_msforeachtable 'ALTER TABLE ? NOCHECK CONSTRAINT ALL';\nGO\n\n")
+            header.append("-- Disable constraints for synthetic data insertion\n")
+            header.append("EXEC sp_msforeachtable 'ALTER TABLE ? NOCHECK CONSTRAINT ALL';\nGO\n\n")
+        f.write("".join(header).encode('utf-8'))
+
+        # Batch rows into multi-row INSERTs so the column list is emitted once
+        # per batch instead of once per row
+        col_names = ", ".join(c['name'] for c in columns)
+        advised = 0
+        workers = os.cpu_count() or 1
+        if args.rows >= _PARALLEL_THRESHOLD and workers > 1:
+            # Row generation is embarrassingly parallel: split the rows over
+            # the cores and write the finished chunks back in order
+            base, extra = divmod(args.rows, workers)
+            sizes = [base + (1 if i < extra else 0) for i in range(workers)]
+            ctx = multiprocessing.get_context('forkserver')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                gen = partial(_generate_chunk, columns, args.engine, args.table, col_names)
+                for chunk in pool.map(gen, sizes):
+                    f.write(chunk)
+                    if _HAS_FADVISE:
+                        advised = _advise_dont_need(f, advised)
+        else:
+            # Locals instead of per-iteration args attribute lookups
+            engine = args.engine
+            table = args.table
+            emit_row = compile_row_emitter(build_row_pipeline(columns, engine, args.rows))
+            # One reusable byte buffer: extended per batch, emptied in place
+            # after each flush instead of reallocated
+            buf = bytearray()
+            batch = []
+            append = batch.append
+            for _ in range(args.rows):
+                append(emit_row())
+                if len(batch) >= 500:
+                    buf += format_insert_batch(table, col_names, batch, engine).encode('utf-8')
+                    batch.clear()
+                    if len(buf) >= _WRITE_BUF_SIZE:
+                        f.write(buf)
+                        del buf[:]
+                        if _HAS_FADVISE:
+                            advised = _advise_dont_need(f, advised)
+            if batch:
+                buf += format_insert_batch(table, col_names, batch, engine).encode('utf-8')
+            if buf:
+                f.write(buf)
+
 
-        for _ in range(args.rows):
-            row_data = {name: provider() for name, provider in providers.items()}
-            
-            col_names = ", ".join(row_data.keys())
-            col_values = ", ".join([format_sql_value(val, args.engine) for val in row_data.values()])
-            
-            insert_stmt = f"INSERT INTO {args.table} ({col_names}) VALUES ({col_values});\n"
-            f.write(insert_stmt)
-            
         if args.engine == 'oracle':
-            f.write("COMMIT;\n")
-            
+            f.write(b"COMMIT;\n")
+
         if args.engine == 'mssql':
-            f.write("\n-- Re-enable constraints\n")
-            f.write("EXEC sp_msforeachtable 'ALTER TABLE ? WITH CHECK CHECK CONSTRAINT ALL';\nGO\n")
+            f.write(b"\n-- Re-enable constraints\n"
+                    b"EXEC sp_msforeachtable 'ALTER TABLE ? WITH CHECK CHECK CONSTRAINT ALL';\nGO\n")
 
     print(f"\nSuccessfully generated {args.rows} rows in '{output_file}'.")
 